@@ -7,7 +7,7 @@ BOLA & Privilege Escalation detection workflow.
 import sys
 
 from auth_fusion.cli import parse_cli
-from auth_fusion.engine import print_report, replay_request
+from auth_fusion.engine import close_session, print_report, replay_request
 from auth_fusion.parser import load_request_file, parse_raw_request
 
 
@@ -25,14 +25,14 @@ def main(argv: list[str] | None = None) -> int:
     # --- Phase 2: Parse the raw request file ---
     print(f"[*] Loading raw request from: {args.request_file}")
     try:
-        raw_text = load_request_file(args.request_file)
+        raw_request = load_request_file(args.request_file, args.request_size)
     except (FileNotFoundError, IOError) as exc:
         print(f"Error reading request file: {exc}", file=sys.stderr)
         return 2
 
     print("[*] Parsing raw HTTP request...")
     try:
-        parsed = parse_raw_request(raw_text)
+        parsed = parse_raw_request(raw_request)
     except ValueError as exc:
         print(f"Error parsing request: {exc}", file=sys.stderr)
         return 2
@@ -59,6 +59,8 @@ def main(argv: list[str] | None = None) -> int:
     except Exception as exc:
         print(f"Error during request replay: {exc}", file=sys.stderr)
         return 2
+    finally:
+        close_session()
 
     # --- Report ---
     print_report(result)
@@ -6,14 +6,50 @@ for the Auth-Fusion BOLA and Privilege Escalation detection tool.
 
 import argparse
 import os
+import stat
 import sys
 
 from auth_fusion import __version__
 
+# Read permission for owner, group, and others
+_READ_ALL = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+class _FastParser(argparse.ArgumentParser):
+    """ArgumentParser that reuses one formatter to validate new arguments.
+
+    ``add_argument`` builds a throwaway HelpFormatter for every argument
+    just to sanity-check its metavar (and, on Python 3.14+, its help
+    string), which also re-runs the terminal colour detection each time.
+    A single cached formatter is enough for those checks; help and usage
+    output still get a fresh one.
+    """
+
+    _validation_formatter: argparse.HelpFormatter | None = None
+    _adding_argument = False
+
+    def _get_validation_formatter(self) -> argparse.HelpFormatter:
+        if self._validation_formatter is None:
+            self._validation_formatter = super()._get_formatter()
+        return self._validation_formatter
+
+    def _get_formatter(self) -> argparse.HelpFormatter:
+        # Older Pythons call _get_formatter() directly from add_argument.
+        if self._adding_argument:
+            return self._get_validation_formatter()
+        return super()._get_formatter()
+
+    def add_argument(self, *args, **kwargs) -> argparse.Action:
+        self._adding_argument = True
+        try:
+            return super().add_argument(*args, **kwargs)
+        finally:
+            self._adding_argument = False
+
 
 def build_parser() -> argparse.ArgumentParser:
     """Build and return the argument parser for Auth-Fusion CLI."""
-    parser = argparse.ArgumentParser(
+    parser = _FastParser(
         prog="auth-fusion",
         description=(
             "Auth-Fusion v{ver} — Automated BOLA & Privilege Escalation "
@@ -89,20 +125,32 @@ def validate_args(args: argparse.Namespace) -> None:
     Raises:
         SystemExit: If the request file does not exist or is not readable.
     """
-    if not os.path.isfile(args.request_file):
+    try:
+        st = os.stat(args.request_file)
+    except OSError:
+        st = None
+
+    if st is None or not stat.S_ISREG(st.st_mode):
         print(
             f"Error: Request file not found: '{args.request_file}'",
             file=sys.stderr,
         )
         sys.exit(1)
 
-    if not os.access(args.request_file, os.R_OK):
+    # Only fall back to access(2) when the mode bits alone don't prove the
+    # file is readable by everyone.
+    if (st.st_mode & _READ_ALL) != _READ_ALL and not os.access(
+        args.request_file, os.R_OK
+    ):
         print(
             f"Error: Request file is not readable: '{args.request_file}'",
             file=sys.stderr,
         )
         sys.exit(1)
 
+    # Keep the size around so the loader can read the file in one go.
+    args.request_size = st.st_size
+
     if not args.attacker_token.strip():
         print("Error: Attacker token cannot be empty.", file=sys.stderr)
         sys.exit(1)
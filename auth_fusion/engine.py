@@ -6,14 +6,24 @@ Broken Object Level Authorization (BOLA) and Privilege Escalation.
 
 from __future__ import annotations
 
-import urllib3
-
-import requests
+import functools
+import sys
+from collections.abc import Collection, Iterable, Mapping
+from typing import TYPE_CHECKING
 
 from auth_fusion.parser import ParsedRequest
 
-# Suppress InsecureRequestWarning when using --proxy with self-signed certs
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+if TYPE_CHECKING:
+    import http.cookiejar
+
+    import requests
+
+# requests/urllib3 are imported lazily on the first replay so that --help,
+# --version and argument errors don't pay for loading them.
+_warnings_disabled = False
+
+# Shared session so repeated replays reuse pooled keep-alive connections
+_session: requests.Session | None = None
 
 # HTTP status codes that indicate the server accepted the request
 SUCCESS_CODES = range(200, 300)
@@ -21,14 +31,43 @@ SUCCESS_CODES = range(200, 300)
 # Minimum response body length (bytes) to consider "meaningful data"
 MIN_BODY_LENGTH = 2
 
+# Maximum number of response body bytes downloaded per replay
+MAX_BODY_BYTES = 8192
+
+# Size of each chunk read from a streamed response body
+BODY_CHUNK_SIZE = 4096
+
+# Headers (lower-cased) that requests must manage itself:
+# - Host: set automatically from the URL.
+# - Accept-Encoding: let requests advertise only the encodings it can
+#   decode (e.g. gzip, deflate, br when brotli is installed).  Forwarding
+#   the original Burp header can cause the server to send an encoding
+#   that the library cannot decompress, resulting in garbage output.
+# - Content-Length: recalculated by requests from the actual body.
+_STRIP_HEADERS = frozenset({"host", "accept-encoding", "content-length"})
+
+# Fixed parts of the vulnerability report
+_BANNER = "=" * 60
+_REPORT_HEADER = (
+    f"\n{_BANNER}\n"
+    "  AUTH-FUSION — Vulnerability Analysis Report\n"
+    f"{_BANNER}\n"
+)
+_REPORT_FOOTER = f"\n{_BANNER}\n\n"
+
 
 class ReplayResult:
-    """Container for the result of a replayed request."""
+    """Container for the result of a replayed request.
+
+    The body may be given as raw bytes, in which case it is only decoded
+    (using ``encoding``) the first time ``body`` is read.
+    """
 
     __slots__ = (
         "status_code",
         "headers",
-        "body",
+        "_body",
+        "_encoding",
         "is_vulnerable",
         "analysis",
     )
@@ -36,17 +75,26 @@ class ReplayResult:
     def __init__(
         self,
         status_code: int,
-        headers: dict[str, str],
-        body: str,
+        headers: Mapping[str, str],
+        body: str | bytes,
         is_vulnerable: bool,
         analysis: str,
+        encoding: str = "utf-8",
     ) -> None:
         self.status_code = status_code
         self.headers = headers
-        self.body = body
+        self._body = body
+        self._encoding = encoding
         self.is_vulnerable = is_vulnerable
         self.analysis = analysis
 
+    @property
+    def body(self) -> str:
+        """The response body as text."""
+        if isinstance(self._body, bytes):
+            self._body = _decode(self._body, self._encoding)
+        return self._body
+
 
 def swap_token(
     headers: dict[str, str], attacker_token: str
@@ -60,30 +108,50 @@ def swap_token(
         headers: The original headers dictionary.
         attacker_token: The low-privilege attacker's token.
 
+    Returns:
+        A new headers dictionary with the swapped token.
+    """
+    return _prepare_headers(headers, attacker_token, ())
+
+
+def _prepare_headers(
+    headers: dict[str, str],
+    attacker_token: str,
+    strip: Collection[str],
+) -> dict[str, str]:
+    """Swap the Authorization token and drop headers in a single pass.
+
+    Args:
+        headers: The original headers dictionary.
+        attacker_token: The low-privilege attacker's token.
+        strip: Lower-cased names of headers to leave out of the result.
+
     Returns:
         A new headers dictionary with the swapped token.
     """
     new_headers: dict[str, str] = {}
-    token_swapped = False
+    # Reuse the original spelling of the Authorization header, if any
+    auth_key = "Authorization"
 
     for key, value in headers.items():
-        if key.lower() == "authorization":
-            new_headers[key] = f"Bearer {attacker_token}"
-            token_swapped = True
-        else:
+        lower = key.lower()
+        if lower == "authorization":
+            auth_key = key
+        elif lower not in strip:
             new_headers[key] = value
 
-    if not token_swapped:
-        new_headers["Authorization"] = f"Bearer {attacker_token}"
-
+    new_headers[auth_key] = f"Bearer {attacker_token}"
     return new_headers
 
 
+@functools.lru_cache(maxsize=256)
 def build_url(
     target_host: str, path: str, use_https: bool = True
 ) -> str:
     """Construct the full URL from host, path, and scheme.
 
+    Results are memoized, since batch runs build the same URLs repeatedly.
+
     Args:
         target_host: The target domain or IP.
         path: The endpoint path (e.g. /api/v1/users).
@@ -100,6 +168,80 @@ def build_url(
     return f"{scheme}://{host}{path}"
 
 
+def _new_session(pool_maxsize: int = 16) -> requests.Session:
+    """Create a session with a connection pool of the given size."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.cookies.set_policy(_reject_cookies_policy())
+    return session
+
+
+def _reject_cookies_policy() -> http.cookiejar.CookiePolicy:
+    """Return a cookie policy that refuses to store any cookie.
+
+    Never carry cookies from one replay into the next: each request must
+    be sent with exactly the credentials it was given.
+    """
+    from http.cookiejar import DefaultCookiePolicy
+
+    return DefaultCookiePolicy(allowed_domains=[])
+
+
+def _get_session() -> requests.Session:
+    """Return the shared module-level session, creating it on first use."""
+    global _session
+
+    if _session is None:
+        _session = _new_session()
+
+    return _session
+
+
+def close_session() -> None:
+    """Close the shared session (if any) and release pooled connections."""
+    global _session
+
+    if _session is not None:
+        _session.close()
+        _session = None
+
+
+def _disable_insecure_warnings() -> None:
+    """Suppress urllib3's InsecureRequestWarning (once per process)."""
+    global _warnings_disabled
+
+    if not _warnings_disabled:
+        import urllib3
+
+        # Suppress InsecureRequestWarning when using --proxy with
+        # self-signed certs
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        _warnings_disabled = True
+
+
+def _keep_headers(
+    request: requests.PreparedRequest,
+) -> requests.PreparedRequest:
+    """Auth hook that sends the request exactly as prepared.
+
+    Passing any auth stops requests from looking up ~/.netrc on every
+    call, which would also overwrite the swapped Authorization header.
+    """
+    return request
+
+
+def _build_proxies(proxy: str | None) -> dict[str, str] | None:
+    """Return a requests ``proxies`` mapping for the optional proxy URL."""
+    if proxy:
+        return {"http": proxy, "https": proxy}
+    return None
+
+
 def replay_request(
     parsed: ParsedRequest,
     attacker_token: str,
@@ -107,6 +249,7 @@ def replay_request(
     use_https: bool = True,
     proxy: str | None = None,
     timeout: int = 30,
+    session: requests.Session | None = None,
 ) -> ReplayResult:
     """Replay the parsed request with the attacker's token.
 
@@ -117,31 +260,93 @@ def replay_request(
         use_https: Whether to use HTTPS.
         proxy: Optional proxy URL for debugging.
         timeout: Request timeout in seconds.
+        session: Optional session to send the request with (defaults to
+            the shared module-level session).
 
     Returns:
         A ReplayResult containing the response and vulnerability analysis.
     """
-    swapped_headers = swap_token(parsed.headers, attacker_token)
-
-    # Remove headers that requests must manage itself.
-    # - Host: set automatically from the URL.
-    # - Accept-Encoding: let requests advertise only the encodings it can
-    #   decode (e.g. gzip, deflate, br when brotli is installed).  Forwarding
-    #   the original Burp header can cause the server to send an encoding
-    #   that the library cannot decompress, resulting in garbage output.
-    # - Content-Length: recalculated by requests from the actual body.
-    _hop_by_hop = {"host", "accept-encoding", "content-length"}
-    for key in list(swapped_headers.keys()):
-        if key.lower() in _hop_by_hop:
-            del swapped_headers[key]
+    _disable_insecure_warnings()
+
+    if session is None:
+        session = _get_session()
+
+    return _replay_with_session(
+        parsed,
+        attacker_token,
+        target_host,
+        use_https,
+        _build_proxies(proxy),
+        timeout,
+        session,
+    )
 
-    url = build_url(target_host, parsed.path, use_https)
 
-    proxies = None
-    if proxy:
-        proxies = {"http": proxy, "https": proxy}
+def replay_many(
+    parsed_list: Iterable[ParsedRequest],
+    attacker_token: str,
+    target_host: str,
+    *,
+    use_https: bool = True,
+    proxy: str | None = None,
+    max_workers: int = 16,
+    timeout: int = 30,
+) -> list[ReplayResult]:
+    """Replay several parsed requests concurrently with the attacker's token.
+
+    All requests share one session whose connection pool is sized to
+    ``max_workers``, so connections to the target host are reused.
+
+    Args:
+        parsed_list: The parsed raw HTTP requests to replay.
+        attacker_token: The low-privilege attacker's Bearer token.
+        target_host: The target domain or IP.
+        use_https: Whether to use HTTPS.
+        proxy: Optional proxy URL for debugging.
+        max_workers: Maximum number of requests in flight at once.
+        timeout: Request timeout in seconds.
+
+    Returns:
+        One ReplayResult per request, in the same order as ``parsed_list``.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    _disable_insecure_warnings()
+    proxies = _build_proxies(proxy)
+
+    def replay(parsed: ParsedRequest) -> ReplayResult:
+        return _replay_with_session(
+            parsed,
+            attacker_token,
+            target_host,
+            use_https,
+            proxies,
+            timeout,
+            session,
+        )
+
+    with _new_session(pool_maxsize=max_workers) as session:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(replay, parsed_list))
 
-    response = requests.request(
+
+def _replay_with_session(
+    parsed: ParsedRequest,
+    attacker_token: str,
+    target_host: str,
+    use_https: bool,
+    proxies: dict[str, str] | None,
+    timeout: int,
+    session: requests.Session,
+) -> ReplayResult:
+    """Send one swapped-token request on ``session`` and analyze it."""
+    swapped_headers = _prepare_headers(
+        parsed.headers, attacker_token, _STRIP_HEADERS
+    )
+
+    url = build_url(target_host, parsed.path, use_https)
+
+    response = session.request(
         method=parsed.method,
         url=url,
         headers=swapped_headers,
@@ -150,19 +355,79 @@ def replay_request(
         timeout=timeout,
         verify=False,
         allow_redirects=False,
+        stream=True,
+        auth=_keep_headers,
     )
 
-    is_vulnerable, analysis = analyze_response(response)
+    try:
+        content = _read_body(response, MAX_BODY_BYTES)
+    finally:
+        response.close()
+
+    return _build_result(
+        response.status_code,
+        response.headers,
+        content,
+        response.encoding or "utf-8",
+    )
+
+
+def _build_result(
+    code: int,
+    headers: Mapping[str, str],
+    content: bytes,
+    encoding: str,
+) -> ReplayResult:
+    """Analyze a (bounded) response body and wrap it in a ReplayResult."""
+    # Only 2xx bodies are inspected; anything else stays undecoded bytes
+    # in the result unless someone asks for it.
+    text = _decode(content, encoding) if code in SUCCESS_CODES else None
+    is_vulnerable, analysis = _analyze(code, text or "")
 
     return ReplayResult(
-        status_code=response.status_code,
-        headers=dict(response.headers),
-        body=response.text,
+        status_code=code,
+        headers=headers,
+        body=content if text is None else text,
         is_vulnerable=is_vulnerable,
         analysis=analysis,
+        encoding=encoding,
     )
 
 
+def _decode(content: bytes, encoding: str) -> str:
+    """Decode a response body, falling back to UTF-8 for unknown charsets."""
+    try:
+        return content.decode(encoding, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+
+def _read_body(response: requests.Response, limit: int) -> bytes:
+    """Read at most ``limit`` bytes from a streamed response body."""
+    chunks: list[bytes] = []
+    remaining = limit
+
+    for chunk in response.iter_content(chunk_size=BODY_CHUNK_SIZE):
+        remaining = _append_chunk(chunks, chunk, remaining)
+        if remaining <= 0:
+            break
+
+    return b"".join(chunks)
+
+
+def _append_chunk(chunks: list[bytes], chunk: bytes, remaining: int) -> int:
+    """Append ``chunk`` truncated to ``remaining`` bytes.
+
+    Only as much of the body as the analysis and report use is kept, so
+    callers stop reading once this returns zero or less.
+
+    Returns:
+        The number of bytes still wanted.
+    """
+    chunks.append(chunk[:remaining])
+    return remaining - len(chunk)
+
+
 def analyze_response(response: requests.Response) -> tuple[bool, str]:
     """Analyze the HTTP response for signs of privilege escalation.
 
@@ -179,7 +444,14 @@ def analyze_response(response: requests.Response) -> tuple[bool, str]:
         A tuple of (is_vulnerable, analysis_message).
     """
     code = response.status_code
-    body = response.text.strip()
+    # The body only matters for 2xx, so don't decode it for anything else
+    body = response.text if code in SUCCESS_CODES else ""
+    return _analyze(code, body)
+
+
+def _analyze(code: int, body: str) -> tuple[bool, str]:
+    """Apply the analyze_response heuristics to a status code and body."""
+    body = body.strip()
 
     if code in (401, 403):
         return False, (
@@ -215,24 +487,43 @@ def analyze_response(response: requests.Response) -> tuple[bool, str]:
     )
 
 
-def print_report(result: ReplayResult) -> None:
-    """Print a formatted vulnerability report to stdout.
+def format_report(result: ReplayResult) -> str:
+    """Format a vulnerability report for a replayed request.
 
     Args:
         result: The ReplayResult from the replayed request.
+
+    Returns:
+        The full report text, ready to be written.
     """
-    banner = "=" * 60
-    print(f"\n{banner}")
-    print("  AUTH-FUSION — Vulnerability Analysis Report")
-    print(banner)
-    print(f"\n  Status Code : {result.status_code}")
-    print(f"  Vulnerable  : {'YES' if result.is_vulnerable else 'NO'}")
-    print(f"\n  Analysis:\n    {result.analysis}")
+    out = [
+        _REPORT_HEADER,
+        f"\n  Status Code : {result.status_code}\n",
+        f"  Vulnerable  : {'YES' if result.is_vulnerable else 'NO'}\n",
+        f"\n  Analysis:\n    {result.analysis}\n",
+    ]
 
     if result.is_vulnerable:
-        print("\n  Response Headers:")
-        for key, value in result.headers.items():
-            print(f"    {key}: {value}")
-        print(f"\n  Response Body (first 500 chars):\n    {result.body[:500]}")
+        out.append("\n  Response Headers:\n")
+        out.extend(
+            f"    {key}: {value}\n" for key, value in result.headers.items()
+        )
+        out.append(
+            f"\n  Response Body (first 500 chars):\n    {result.body[:500]}\n"
+        )
+
+    out.append(_REPORT_FOOTER)
+    return "".join(out)
 
-    print(f"\n{banner}\n")
+
+def print_report(result: ReplayResult) -> None:
+    """Print a formatted vulnerability report to stdout.
+
+    Args:
+        result: The ReplayResult from the replayed request.
+    """
+    # One write (and flush) for the whole report instead of one per line.
+    # This stays on the text layer rather than sys.stdout.buffer so the
+    # console's encoding is honoured and ordering with print() is kept.
+    sys.stdout.write(format_report(result))
+    sys.stdout.flush()
@@ -0,0 +1,139 @@
+"""Phase 3 (async): HTTP/2 Replay Backend.
+
+Replays many requests concurrently over multiplexed HTTP/2 connections
+using httpx, reusing the token swapping and response analysis of the
+synchronous engine.
+
+Requires the optional ``httpx`` package with HTTP/2 support::
+
+    pip install "httpx[http2]"
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from http.cookiejar import CookieJar
+from typing import TYPE_CHECKING
+
+from auth_fusion.engine import (
+    _STRIP_HEADERS,
+    BODY_CHUNK_SIZE,
+    MAX_BODY_BYTES,
+    ReplayResult,
+    _append_chunk,
+    _build_result,
+    _prepare_headers,
+    _reject_cookies_policy,
+    build_url,
+)
+from auth_fusion.parser import ParsedRequest
+
+if TYPE_CHECKING:
+    import httpx
+
+
+async def replay_request_async(
+    parsed: ParsedRequest,
+    attacker_token: str,
+    target_host: str,
+    client: httpx.AsyncClient,
+    use_https: bool = True,
+    timeout: int = 30,
+) -> ReplayResult:
+    """Replay the parsed request with the attacker's token on ``client``.
+
+    Args:
+        parsed: The parsed raw HTTP request.
+        attacker_token: The low-privilege attacker's Bearer token.
+        target_host: The target domain or IP.
+        client: The httpx client to send the request with.
+        use_https: Whether to use HTTPS.
+        timeout: Request timeout in seconds.
+
+    Returns:
+        A ReplayResult containing the response and vulnerability analysis.
+    """
+    swapped_headers = _prepare_headers(
+        parsed.headers, attacker_token, _STRIP_HEADERS
+    )
+
+    url = build_url(target_host, parsed.path, use_https)
+
+    async with client.stream(
+        parsed.method,
+        url,
+        headers=swapped_headers,
+        content=parsed.body,
+        timeout=timeout,
+        follow_redirects=False,
+    ) as response:
+        chunks: list[bytes] = []
+        remaining = MAX_BODY_BYTES
+        async for chunk in response.aiter_bytes(chunk_size=BODY_CHUNK_SIZE):
+            remaining = _append_chunk(chunks, chunk, remaining)
+            if remaining <= 0:
+                break
+
+    return _build_result(
+        response.status_code,
+        response.headers,
+        b"".join(chunks),
+        response.charset_encoding or "utf-8",
+    )
+
+
+async def replay_many_async(
+    parsed_list: Iterable[ParsedRequest],
+    attacker_token: str,
+    target_host: str,
+    *,
+    use_https: bool = True,
+    proxy: str | None = None,
+    max_connections: int = 10,
+    timeout: int = 30,
+) -> list[ReplayResult]:
+    """Replay several parsed requests concurrently over HTTP/2.
+
+    Args:
+        parsed_list: The parsed raw HTTP requests to replay.
+        attacker_token: The low-privilege attacker's Bearer token.
+        target_host: The target domain or IP.
+        use_https: Whether to use HTTPS.
+        proxy: Optional proxy URL for debugging.
+        max_connections: Maximum number of connections to open.
+        timeout: Request timeout in seconds.
+
+    Returns:
+        One ReplayResult per request, in the same order as ``parsed_list``.
+    """
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+    )
+    cookies = CookieJar(policy=_reject_cookies_policy())
+
+    async with httpx.AsyncClient(
+        http2=True,
+        verify=False,
+        proxy=proxy,
+        limits=limits,
+        cookies=cookies,
+    ) as client:
+        return list(
+            await asyncio.gather(
+                *(
+                    replay_request_async(
+                        parsed,
+                        attacker_token,
+                        target_host,
+                        client,
+                        use_https=use_https,
+                        timeout=timeout,
+                    )
+                    for parsed in parsed_list
+                )
+            )
+        )
@@ -6,6 +6,39 @@ structured components that the Python requests library can use.
 
 from __future__ import annotations
 
+import os
+import re
+import sys
+
+# Line endings accepted in the head: CRLF, bare LF, or bare CR (the same
+# set text-mode universal newlines recognises)
+_LINE_END = re.compile(r"\r\n|\r|\n")
+
+# The blank line separating the head from the body: two line endings in a
+# row.  A bare CR only counts when it is not the start of a CRLF.
+_HEAD_END = re.compile(r"(?:\r\n|\r(?!\n)|\n){2}")
+
+# Method and path at the start of the request line (the version is ignored)
+_REQUEST_LINE = re.compile(r"(\S+)\s+(\S+)")
+
+# Header names seen in almost every request.  Parsed keys are mapped onto
+# these shared objects so later lookups can match on identity.
+_COMMON_HEADERS = {
+    name: sys.intern(name)
+    for name in (
+        "Host",
+        "Authorization",
+        "Content-Type",
+        "Content-Length",
+        "Accept",
+        "Accept-Encoding",
+        "Accept-Language",
+        "User-Agent",
+        "Cookie",
+        "Connection",
+    )
+}
+
 
 class ParsedRequest:
     """Container for a parsed raw HTTP request."""
@@ -32,59 +65,61 @@ class ParsedRequest:
         )
 
 
-def parse_raw_request(raw_text: str) -> ParsedRequest:
+def parse_raw_request(raw_text: str | bytes) -> ParsedRequest:
     """Parse a raw HTTP request into its components.
 
     Handles:
       - Various HTTP methods (GET, POST, PUT, DELETE, PATCH, etc.)
       - Endpoint path extraction
-      - Header dictionary construction (handles \\r\\n line endings)
-      - Request body (JSON, XML, form data) or absent body
+      - Header dictionary construction (handles \\r\\n, \\n and \\r endings)
+      - Request body (JSON, XML, form data) or absent body, kept verbatim
       - Multi-value headers with the same name (last value wins)
 
     Args:
-        raw_text: The raw HTTP request as a string.
+        raw_text: The raw HTTP request, as a string or UTF-8 bytes.
 
     Returns:
         A ParsedRequest with method, path, headers, and body.
 
     Raises:
-        ValueError: If the request line is malformed.
+        ValueError: If the request line is malformed or the bytes are not
+            valid UTF-8.
     """
-    # Normalize line endings: replace \r\n with \n, then split
-    normalized = raw_text.replace("\r\n", "\n")
-
-    # Split head (request-line + headers) from body on the first blank line
-    if "\n\n" in normalized:
-        head, body = normalized.split("\n\n", 1)
+    if isinstance(raw_text, bytes):
+        raw_text = raw_text.decode("utf-8")
+
+    # Split head (request-line + headers) from body on the first blank line.
+    # The body is passed through untouched.
+    match = _HEAD_END.search(raw_text)
+    if match:
+        head = raw_text[: match.start()]
+        body = raw_text[match.end() :]
         body = body if body.strip() else None
     else:
-        head = normalized
+        head = raw_text
         body = None
 
-    lines = head.split("\n")
+    lines = _LINE_END.split(head)
 
     # --- Parse request line ---
     request_line = lines[0].strip()
-    parts = request_line.split()
-    if len(parts) < 2:
+    line_match = _REQUEST_LINE.match(request_line)
+    if line_match is None:
         raise ValueError(f"Malformed request line: {request_line!r}")
 
-    method = parts[0].upper()
-    path = parts[1]
+    method = line_match.group(1).upper()
+    path = line_match.group(2)
 
     # --- Parse headers ---
     headers: dict[str, str] = {}
     for line in lines[1:]:
-        line = line.strip()
-        if not line:
-            continue
-        colon_idx = line.find(":")
-        if colon_idx == -1:
+        # Blank lines and lines without a colon have no separator.
+        # Stripping key and value covers surrounding whitespace and \r.
+        key, sep, value = line.partition(":")
+        if not sep:
             continue
-        key = line[:colon_idx].strip()
-        value = line[colon_idx + 1 :].strip()
-        headers[key] = value
+        key = key.strip()
+        headers[_COMMON_HEADERS.get(key, key)] = value.strip()
 
     return ParsedRequest(
         method=method,
@@ -94,18 +129,29 @@ def parse_raw_request(raw_text: str) -> ParsedRequest:
     )
 
 
-def load_request_file(filepath: str) -> str:
-    """Read and return the contents of a raw request file.
+def load_request_file(filepath: str, size: int = -1) -> bytes:
+    """Read and return the raw contents of a request file.
 
     Args:
         filepath: Path to the raw request text file.
+        size: Optional file size in bytes (e.g. from a prior ``os.stat``).
+            If omitted, it is taken from ``os.fstat``.
 
     Returns:
-        The raw text content of the file.
+        The raw bytes of the file.
 
     Raises:
         FileNotFoundError: If the file does not exist.
         IOError: If the file cannot be read.
     """
-    with open(filepath, "r", encoding="utf-8") as fh:
-        return fh.read()
+    fd = os.open(filepath, os.O_RDONLY)
+    try:
+        if size < 0:
+            size = os.fstat(fd).st_size
+        # Ask for the whole file at once; keep reading in case it grew
+        chunks = []
+        while chunk := os.read(fd, size + 1):
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    return b"".join(chunks)
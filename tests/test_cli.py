@@ -58,6 +58,18 @@ class TestBuildParser:
         ])
         assert args.proxy is None
 
+    def test_validation_formatter_is_cached(self):
+        parser = build_parser()
+        formatter = parser._get_validation_formatter()
+        assert parser._get_validation_formatter() is formatter
+        # Help output must not reuse the cached validation formatter
+        assert parser._get_formatter() is not formatter
+
+    def test_help_lists_arguments(self):
+        help_text = build_parser().format_help()
+        assert "--attacker-token" in help_text
+        assert "--proxy" in help_text
+
     def test_missing_required_args(self):
         parser = build_parser()
         with pytest.raises(SystemExit):
@@ -89,6 +101,28 @@ class TestValidateArgs:
         # Should not raise
         validate_args(args)
 
+    def test_directory_exits(self, tmp_path):
+        parser = build_parser()
+        args = parser.parse_args([
+            "--attacker-token", "token",
+            "--target-host", "host",
+            "--request-file", str(tmp_path),
+        ])
+        with pytest.raises(SystemExit):
+            validate_args(args)
+
+    def test_records_request_size(self, tmp_path):
+        f = tmp_path / "req.txt"
+        f.write_bytes(b"GET / HTTP/1.1\r\n\r\n")
+        parser = build_parser()
+        args = parser.parse_args([
+            "--attacker-token", "token",
+            "--target-host", "host",
+            "--request-file", str(f),
+        ])
+        validate_args(args)
+        assert args.request_size == 18
+
     def test_empty_token_exits(self, tmp_path):
         f = tmp_path / "req.txt"
         f.write_text("GET / HTTP/1.1\r\n\r\n")
@@ -1,123 +1,216 @@
 """Tests for the execution & manipulation engine (Phase 3)."""
 
+import io
+import os
+import subprocess
+import sys
+import urllib.request
+from email.message import Message
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+import auth_fusion
 from auth_fusion.engine import (
+    MAX_BODY_BYTES,
     ReplayResult,
     analyze_response,
+    _get_session,
+    _new_session,
     build_url,
+    close_session,
+    format_report,
     print_report,
+    replay_many,
     replay_request,
     swap_token,
 )
 from auth_fusion.parser import ParsedRequest
 
 
+def _stream_response(
+    status_code: int = 200, chunks=(b'{"ok": true}',)
+) -> SimpleNamespace:
+    """Build a minimal stand-in for a streamed requests.Response."""
+    resp = SimpleNamespace(
+        status_code=status_code,
+        encoding="utf-8",
+        headers={"Content-Type": "application/json"},
+        closed=False,
+    )
+    resp.iter_content = lambda chunk_size: iter(chunks)
+    resp.close = lambda: setattr(resp, "closed", True)
+    return resp
+
+
+def test_import_does_not_load_requests():
+    """requests is only imported once a request is actually replayed."""
+    code = (
+        "import sys, auth_fusion.__main__; "
+        "print('requests' in sys.modules)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.dirname(auth_fusion.__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == "False"
+
+
 class TestSwapToken:
     """Tests for the token swapping function."""
 
-    def test_swaps_authorization_header(self):
-        headers = {
-            "Host": "example.com",
-            "Authorization": "Bearer victim_token",
-            "Accept": "application/json",
-        }
-        result = swap_token(headers, "attacker_token")
-        assert result["Authorization"] == "Bearer attacker_token"
-        assert result["Host"] == "example.com"
-        assert result["Accept"] == "application/json"
-
-    def test_case_insensitive_authorization(self):
-        headers = {
-            "authorization": "Bearer old_token",
-        }
-        result = swap_token(headers, "new_token")
-        assert result["authorization"] == "Bearer new_token"
-
-    def test_adds_authorization_if_missing(self):
-        headers = {"Host": "example.com"}
-        result = swap_token(headers, "token")
-        assert result["Authorization"] == "Bearer token"
-
-    def test_does_not_mutate_original(self):
-        headers = {"Authorization": "Bearer old"}
-        result = swap_token(headers, "new")
-        assert headers["Authorization"] == "Bearer old"
-        assert result["Authorization"] == "Bearer new"
+    @pytest.mark.parametrize(
+        "headers,token,expected",
+        [
+            (
+                {
+                    "Host": "example.com",
+                    "Authorization": "Bearer victim_token",
+                    "Accept": "application/json",
+                },
+                "attacker_token",
+                {
+                    "Host": "example.com",
+                    "Authorization": "Bearer attacker_token",
+                    "Accept": "application/json",
+                },
+            ),
+            (
+                {"authorization": "Bearer old_token"},
+                "new_token",
+                {"authorization": "Bearer new_token"},
+            ),
+            (
+                {"Host": "example.com"},
+                "token",
+                {"Host": "example.com", "Authorization": "Bearer token"},
+            ),
+            (
+                {"Authorization": "Bearer a", "authorization": "Bearer b"},
+                "new",
+                {"authorization": "Bearer new"},
+            ),
+        ],
+    )
+    def test_swap_token(self, headers, token, expected):
+        original = dict(headers)
+        result = swap_token(headers, token)
+        assert result == expected
+        assert headers == original  # input is not mutated
 
 
 class TestBuildUrl:
     """Tests for URL construction."""
 
-    def test_https_url(self):
-        url = build_url("api.example.com", "/api/v1/users", use_https=True)
-        assert url == "https://api.example.com/api/v1/users"
-
-    def test_http_url(self):
-        url = build_url("api.example.com", "/api/v1/users", use_https=False)
-        assert url == "http://api.example.com/api/v1/users"
-
-    def test_trailing_slash_on_host(self):
-        url = build_url("api.example.com/", "/api/v1/users")
-        assert url == "https://api.example.com/api/v1/users"
-
-    def test_missing_leading_slash_on_path(self):
-        url = build_url("api.example.com", "api/v1/users")
-        assert url == "https://api.example.com/api/v1/users"
+    @pytest.mark.parametrize(
+        "host,path,use_https,expected",
+        [
+            (
+                "api.example.com",
+                "/api/v1/users",
+                True,
+                "https://api.example.com/api/v1/users",
+            ),
+            (
+                "api.example.com",
+                "/api/v1/users",
+                False,
+                "http://api.example.com/api/v1/users",
+            ),
+            (
+                "api.example.com/",
+                "/api/v1/users",
+                True,
+                "https://api.example.com/api/v1/users",
+            ),
+            (
+                "api.example.com",
+                "api/v1/users",
+                True,
+                "https://api.example.com/api/v1/users",
+            ),
+        ],
+    )
+    def test_build_url(self, host, path, use_https, expected):
+        assert build_url(host, path, use_https=use_https) == expected
+
+    def test_repeated_calls_are_cached(self):
+        build_url.cache_clear()
+        first = build_url("api.example.com", "/cached")
+        assert build_url("api.example.com", "/cached") is first
+        assert build_url.cache_info().hits == 1
 
 
 class TestAnalyzeResponse:
     """Tests for response analysis heuristics."""
 
-    def _mock_response(self, status_code: int, text: str) -> MagicMock:
-        resp = MagicMock()
-        resp.status_code = status_code
-        resp.text = text
-        return resp
-
-    def test_401_is_safe(self):
-        resp = self._mock_response(401, "Unauthorized")
+    def _mock_response(self, status_code: int, text: str) -> SimpleNamespace:
+        return SimpleNamespace(status_code=status_code, text=text)
+
+    @pytest.mark.parametrize(
+        "status_code,text,expected_vuln,expected_label",
+        [
+            (401, "Unauthorized", False, "SAFE"),
+            (403, "Forbidden", False, "SAFE"),
+            (404, "Not Found", False, "INCONCLUSIVE"),
+            (200, '{"user": "admin", "role": "admin"}', True, "VULNERABLE"),
+            (200, "", False, "LIKELY SAFE"),
+            (500, "Server Error", False, "MANUAL REVIEW"),
+        ],
+    )
+    def test_analyze(self, status_code, text, expected_vuln, expected_label):
+        resp = self._mock_response(status_code, text)
         is_vuln, msg = analyze_response(resp)
-        assert is_vuln is False
-        assert "SAFE" in msg
+        assert is_vuln is expected_vuln
+        assert expected_label in msg
 
-    def test_403_is_safe(self):
-        resp = self._mock_response(403, "Forbidden")
-        is_vuln, msg = analyze_response(resp)
+    def test_error_body_is_not_decoded(self):
+        class ForbiddenResponse:
+            status_code = 403
+
+            @property
+            def text(self):
+                raise AssertionError("error bodies must not be decoded")
+
+        is_vuln, msg = analyze_response(ForbiddenResponse())
         assert is_vuln is False
         assert "SAFE" in msg
 
-    def test_404_is_inconclusive(self):
-        resp = self._mock_response(404, "Not Found")
-        is_vuln, msg = analyze_response(resp)
-        assert is_vuln is False
-        assert "INCONCLUSIVE" in msg
 
-    def test_200_with_data_is_vulnerable(self):
-        resp = self._mock_response(200, '{"user": "admin", "role": "admin"}')
-        is_vuln, msg = analyze_response(resp)
-        assert is_vuln is True
-        assert "VULNERABLE" in msg
+class TestReplayResult:
+    """Tests for the ReplayResult container."""
 
-    def test_200_with_empty_body_is_safe(self):
-        resp = self._mock_response(200, "")
-        is_vuln, msg = analyze_response(resp)
-        assert is_vuln is False
-        assert "LIKELY SAFE" in msg
+    def test_bytes_body_is_decoded_on_access(self):
+        result = ReplayResult(
+            status_code=403,
+            headers={},
+            body="caf\u00e9".encode("latin-1"),
+            is_vulnerable=False,
+            analysis="[SAFE]",
+            encoding="latin-1",
+        )
+        assert result.body == "caf\u00e9"
 
-    def test_500_needs_manual_review(self):
-        resp = self._mock_response(500, "Server Error")
-        is_vuln, msg = analyze_response(resp)
-        assert is_vuln is False
-        assert "MANUAL REVIEW" in msg
+    def test_unknown_encoding_falls_back_to_utf8(self):
+        result = ReplayResult(
+            status_code=403,
+            headers={},
+            body=b"denied",
+            is_vulnerable=False,
+            analysis="[SAFE]",
+            encoding="no-such-charset",
+        )
+        assert result.body == "denied"
 
 
 class TestPrintReport:
-    """Tests for the report printer."""
+    """Tests for the report formatter and printer."""
 
-    def test_print_safe_report(self, capsys):
+    def test_format_safe_report(self):
         result = ReplayResult(
             status_code=403,
             headers={"Content-Type": "text/plain"},
@@ -125,12 +218,12 @@ class TestPrintReport:
             is_vulnerable=False,
             analysis="[SAFE] Access Denied",
         )
-        print_report(result)
-        captured = capsys.readouterr()
-        assert "403" in captured.out
-        assert "NO" in captured.out
+        report = format_report(result)
+        assert "403" in report
+        assert "NO" in report
+        assert "Response Body" not in report
 
-    def test_print_vulnerable_report(self, capsys):
+    def test_format_vulnerable_report(self):
         result = ReplayResult(
             status_code=200,
             headers={"Content-Type": "application/json"},
@@ -138,24 +231,37 @@ class TestPrintReport:
             is_vulnerable=True,
             analysis="[VULNERABLE] HTTP 200",
         )
+        report = format_report(result)
+        assert "200" in report
+        assert "YES" in report
+        assert "secret" in report
+
+    def test_report_is_written_once(self, monkeypatch):
+        stdout = MagicMock()
+        monkeypatch.setattr("sys.stdout", stdout)
+        result = ReplayResult(
+            status_code=200,
+            headers={"A": "1", "B": "2"},
+            body="data",
+            is_vulnerable=True,
+            analysis="[VULNERABLE] HTTP 200",
+        )
         print_report(result)
-        captured = capsys.readouterr()
-        assert "200" in captured.out
-        assert "YES" in captured.out
-        assert "secret" in captured.out
+        stdout.write.assert_called_once_with(format_report(result))
+        assert "    A: 1\n    B: 2\n" in stdout.write.call_args.args[0]
 
 
 class TestReplayRequest:
     """Tests for the replay_request function."""
 
-    @patch("auth_fusion.engine.requests.request")
-    def test_strips_accept_encoding_header(self, mock_request):
+    def _mock_session(self, response=None) -> MagicMock:
+        session = MagicMock()
+        session.request.return_value = response or _stream_response()
+        return session
+
+    def test_strips_accept_encoding_header(self):
         """Accept-Encoding from Burp must be removed so requests can manage it."""
-        mock_resp = MagicMock()
-        mock_resp.status_code = 200
-        mock_resp.text = '{"ok": true}'
-        mock_resp.headers = {"Content-Type": "application/json"}
-        mock_request.return_value = mock_resp
+        session = self._mock_session()
 
         parsed = ParsedRequest(
             method="GET",
@@ -168,21 +274,16 @@ class TestReplayRequest:
             body=None,
         )
 
-        replay_request(parsed, "attacker", "example.com")
+        replay_request(parsed, "attacker", "example.com", session=session)
 
-        sent_headers = mock_request.call_args.kwargs["headers"]
+        sent_headers = session.request.call_args.kwargs["headers"]
         for key in sent_headers:
             assert key.lower() != "accept-encoding"
             assert key.lower() != "host"
 
-    @patch("auth_fusion.engine.requests.request")
-    def test_strips_content_length_header(self, mock_request):
+    def test_strips_content_length_header(self):
         """Content-Length from Burp must be removed so requests recalculates it."""
-        mock_resp = MagicMock()
-        mock_resp.status_code = 200
-        mock_resp.text = '{"ok": true}'
-        mock_resp.headers = {"Content-Type": "application/json"}
-        mock_request.return_value = mock_resp
+        session = self._mock_session()
 
         parsed = ParsedRequest(
             method="POST",
@@ -196,10 +297,126 @@ class TestReplayRequest:
             body='{"key": "value"}',
         )
 
-        replay_request(parsed, "attacker", "example.com")
+        replay_request(parsed, "attacker", "example.com", session=session)
 
-        sent_headers = mock_request.call_args.kwargs["headers"]
+        sent_headers = session.request.call_args.kwargs["headers"]
         lower_keys = {k.lower() for k in sent_headers}
         assert "content-length" not in lower_keys
         assert "accept-encoding" not in lower_keys
         assert "host" not in lower_keys
+
+    def test_streams_and_bounds_body(self):
+        resp = _stream_response(chunks=[b"x" * 4096] * 10)
+        session = self._mock_session(resp)
+        parsed = ParsedRequest("GET", "/api/data", {}, None)
+
+        result = replay_request(
+            parsed, "attacker", "example.com", session=session
+        )
+
+        assert session.request.call_args.kwargs["stream"] is True
+        assert len(result.body) == MAX_BODY_BYTES
+        assert result.is_vulnerable is True
+        assert resp.closed is True
+
+    def test_error_body_kept_as_bytes(self):
+        resp = _stream_response(403, [b"Forbidden"])
+        session = self._mock_session(resp)
+        parsed = ParsedRequest("GET", "/api/data", {}, None)
+
+        result = replay_request(
+            parsed, "attacker", "example.com", session=session
+        )
+
+        assert result._body == b"Forbidden"
+        assert result.body == "Forbidden"
+        assert result.headers is resp.headers
+
+    def test_netrc_does_not_override_token(self, tmp_path, monkeypatch):
+        """requests must not replace the swapped token with ~/.netrc auth."""
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        netrc = tmp_path / "netrc"
+        netrc.write_text("machine example.com login victim password s3cret\n")
+        monkeypatch.setenv("NETRC", str(netrc))
+        sent = []
+
+        def send(adapter, request, **kwargs):
+            sent.append(request)
+            response = requests.Response()
+            response.status_code = 403
+            response.raw = io.BytesIO(b"")
+            return response
+
+        monkeypatch.setattr(HTTPAdapter, "send", send)
+        parsed = ParsedRequest("GET", "/api/data", {}, None)
+
+        with _new_session() as session:
+            replay_request(parsed, "attacker", "example.com", session=session)
+
+        assert sent[0].headers["Authorization"] == "Bearer attacker"
+
+    @patch("auth_fusion.engine._get_session")
+    def test_uses_shared_session_by_default(self, mock_get_session):
+        session = self._mock_session()
+        mock_get_session.return_value = session
+        parsed = ParsedRequest("GET", "/api/data", {}, None)
+
+        replay_request(parsed, "attacker", "example.com")
+
+        session.request.assert_called_once()
+
+
+class TestReplayMany:
+    """Tests for concurrent batch replays."""
+
+    @patch("auth_fusion.engine._new_session")
+    def test_replays_in_order_on_one_session(self, mock_new_session):
+        def respond(**kwargs):
+            denied = kwargs["url"].endswith("/deny")
+            return _stream_response(403 if denied else 200)
+
+        session = MagicMock()
+        session.__enter__.return_value = session
+        session.request.side_effect = respond
+        mock_new_session.return_value = session
+        paths = ["/a", "/deny", "/b", "/deny"]
+        parsed_list = [ParsedRequest("GET", p, {}, None) for p in paths]
+
+        results = replay_many(
+            parsed_list, "attacker", "example.com", max_workers=2
+        )
+
+        mock_new_session.assert_called_once_with(pool_maxsize=2)
+        assert [r.status_code for r in results] == [200, 403, 200, 403]
+        assert session.request.call_count == 4
+        session.__exit__.assert_called_once()
+
+
+class TestSession:
+    """Tests for the shared session helpers."""
+
+    def test_session_is_reused_until_closed(self):
+        session = _get_session()
+        try:
+            assert _get_session() is session
+        finally:
+            close_session()
+        assert _get_session() is not session
+        close_session()
+
+    def test_session_does_not_store_cookies(self):
+        """Set-Cookie from one replay must not leak into the next."""
+        message = Message()
+        message["Set-Cookie"] = "sid=victim; Path=/"
+        response = SimpleNamespace(info=lambda: message)
+
+        session = _get_session()
+        try:
+            session.cookies.extract_cookies(
+                response, urllib.request.Request("https://example.com/")
+            )
+            assert len(session.cookies) == 0
+        finally:
+            close_session()
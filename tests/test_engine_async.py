@@ -0,0 +1,88 @@
+"""Tests for the async HTTP/2 replay backend (Phase 3)."""
+
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("h2")  # needed for httpx.AsyncClient(http2=True)
+
+from auth_fusion.engine_async import (  # noqa: E402
+    replay_many_async,
+    replay_request_async,
+)
+from auth_fusion.parser import ParsedRequest  # noqa: E402
+
+
+def _handler(request):
+    if request.url.path == "/deny":
+        return httpx.Response(403, text="Forbidden")
+    return httpx.Response(
+        200,
+        json={"path": request.url.path},
+        headers={"Set-Cookie": "sid=victim; Path=/"},
+    )
+
+
+class TestReplayRequestAsync:
+    """Tests for replay_request_async."""
+
+    def test_swaps_token_and_strips_headers(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return _handler(request)
+
+        parsed = ParsedRequest(
+            method="GET",
+            path="/api/data",
+            headers={
+                "Host": "example.com",
+                "Authorization": "Bearer victim",
+                "Content-Length": "999",
+            },
+            body=None,
+        )
+
+        async def run():
+            transport = httpx.MockTransport(handler)
+            async with httpx.AsyncClient(transport=transport) as client:
+                return await replay_request_async(
+                    parsed, "attacker", "example.com", client
+                )
+
+        result = asyncio.run(run())
+        assert result.status_code == 200
+        assert result.is_vulnerable is True
+        assert "/api/data" in result.body
+        assert seen[0].headers["Authorization"] == "Bearer attacker"
+        assert seen[0].headers.get("Content-Length") != "999"
+
+
+class TestReplayManyAsync:
+    """Tests for replay_many_async."""
+
+    def test_replays_in_order_without_cookies(self, monkeypatch):
+        sent_cookies = []
+        real_client = httpx.AsyncClient
+
+        def handler(request):
+            sent_cookies.append(request.headers.get("Cookie"))
+            return _handler(request)
+
+        def client_factory(**kwargs):
+            kwargs["transport"] = httpx.MockTransport(handler)
+            return real_client(**kwargs)
+
+        monkeypatch.setattr(httpx, "AsyncClient", client_factory)
+        paths = ["/a", "/deny", "/b"]
+        parsed_list = [ParsedRequest("GET", p, {}, None) for p in paths]
+
+        results = asyncio.run(
+            replay_many_async(parsed_list, "attacker", "example.com")
+        )
+
+        assert [r.status_code for r in results] == [200, 403, 200]
+        assert results[1].body == "Forbidden"
+        assert sent_cookies == [None, None, None]
@@ -1,6 +1,6 @@
 """Tests for the main entry point (__main__.py)."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -8,6 +8,63 @@ from auth_fusion.__main__ import main
 from auth_fusion.engine import ReplayResult
 
 
+USERS_REQUEST = (
+    b"GET /api/v1/users HTTP/1.1\r\n"
+    b"Host: example.com\r\n"
+    b"Authorization: Bearer victim\r\n"
+    b"\r\n"
+)
+
+ADMIN_REQUEST = (
+    b"GET /api/v1/admin HTTP/1.1\r\n"
+    b"Host: example.com\r\n"
+    b"Authorization: Bearer victim\r\n"
+    b"\r\n"
+)
+
+
+@pytest.fixture(scope="session")
+def users_request_file(tmp_path_factory):
+    """Raw GET request for /api/v1/users, written once per session."""
+    f = tmp_path_factory.mktemp("req") / "users.txt"
+    f.write_bytes(USERS_REQUEST)
+    return str(f)
+
+
+@pytest.fixture(scope="session")
+def admin_request_file(tmp_path_factory):
+    """Raw GET request for /api/v1/admin, written once per session."""
+    f = tmp_path_factory.mktemp("req") / "admin.txt"
+    f.write_bytes(ADMIN_REQUEST)
+    return str(f)
+
+
+@pytest.fixture
+def patched_loader(monkeypatch, users_request_file, admin_request_file):
+    """Serve the shared request files from memory instead of re-reading.
+
+    The files still exist on disk so that CLI validation runs for real;
+    only the read in main() is short-circuited.
+    """
+    store = {
+        users_request_file: USERS_REQUEST,
+        admin_request_file: ADMIN_REQUEST,
+    }
+    monkeypatch.setattr(
+        "auth_fusion.__main__.load_request_file",
+        lambda path, size=-1: store[path],
+    )
+    return store
+
+
+@pytest.fixture
+def mock_replay(monkeypatch):
+    """Replace replay_request in __main__ with a MagicMock."""
+    mock = MagicMock()
+    monkeypatch.setattr("auth_fusion.__main__.replay_request", mock)
+    return mock
+
+
 class TestMain:
     """Tests for the main function."""
 
@@ -30,15 +87,9 @@ class TestMain:
         ])
         assert result == 2
 
-    @patch("auth_fusion.__main__.replay_request")
-    def test_successful_safe_run(self, mock_replay, tmp_path):
-        f = tmp_path / "req.txt"
-        f.write_text(
-            "GET /api/v1/users HTTP/1.1\r\n"
-            "Host: example.com\r\n"
-            "Authorization: Bearer victim\r\n"
-            "\r\n"
-        )
+    def test_successful_safe_run(
+        self, mock_replay, patched_loader, users_request_file
+    ):
         mock_replay.return_value = ReplayResult(
             status_code=403,
             headers={},
@@ -49,19 +100,13 @@ class TestMain:
         result = main([
             "--attacker-token", "attacker",
             "--target-host", "example.com",
-            "--request-file", str(f),
+            "--request-file", users_request_file,
         ])
         assert result == 0
 
-    @patch("auth_fusion.__main__.replay_request")
-    def test_successful_vulnerable_run(self, mock_replay, tmp_path):
-        f = tmp_path / "req.txt"
-        f.write_text(
-            "GET /api/v1/admin HTTP/1.1\r\n"
-            "Host: example.com\r\n"
-            "Authorization: Bearer victim\r\n"
-            "\r\n"
-        )
+    def test_successful_vulnerable_run(
+        self, mock_replay, patched_loader, admin_request_file
+    ):
         mock_replay.return_value = ReplayResult(
             status_code=200,
             headers={"Content-Type": "application/json"},
@@ -72,23 +117,18 @@ class TestMain:
         result = main([
             "--attacker-token", "attacker",
             "--target-host", "example.com",
-            "--request-file", str(f),
+            "--request-file", admin_request_file,
         ])
         assert result == 1
+        assert mock_replay.call_args.kwargs["parsed"].path == "/api/v1/admin"
 
-    @patch("auth_fusion.__main__.replay_request")
-    def test_replay_exception_returns_error(self, mock_replay, tmp_path):
-        f = tmp_path / "req.txt"
-        f.write_text(
-            "GET /api/v1/users HTTP/1.1\r\n"
-            "Host: example.com\r\n"
-            "Authorization: Bearer victim\r\n"
-            "\r\n"
-        )
+    def test_replay_exception_returns_error(
+        self, mock_replay, patched_loader, users_request_file
+    ):
         mock_replay.side_effect = ConnectionError("Connection refused")
         result = main([
             "--attacker-token", "attacker",
             "--target-host", "example.com",
-            "--request-file", str(f),
+            "--request-file", users_request_file,
         ])
         assert result == 2
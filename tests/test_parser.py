@@ -1,89 +1,147 @@
 """Tests for the raw HTTP request parser (Phase 2)."""
 
+import sys
+
 import pytest
 
 from auth_fusion.parser import ParsedRequest, load_request_file, parse_raw_request
 
 
+RAW_GET_BASIC = (
+    "GET /api/v1/users HTTP/1.1\r\n"
+    "Host: example.com\r\n"
+    "Authorization: Bearer victim_token_123\r\n"
+    "Accept: application/json\r\n"
+    "\r\n"
+)
+
+RAW_POST_JSON = (
+    "POST /api/v1/users/update HTTP/1.1\r\n"
+    "Host: example.com\r\n"
+    "Content-Type: application/json\r\n"
+    "Authorization: Bearer admin_token\r\n"
+    "\r\n"
+    '{"name": "John", "role": "admin"}'
+)
+
+RAW_PUT = (
+    "PUT /api/v1/profile/42 HTTP/1.1\r\n"
+    "Host: api.target.com\r\n"
+    "Authorization: Bearer token\r\n"
+    "\r\n"
+    "field1=value1&field2=value2"
+)
+
+RAW_DELETE = (
+    "DELETE /api/v1/users/99 HTTP/1.1\r\n"
+    "Host: example.com\r\n"
+    "Authorization: Bearer token\r\n"
+    "\r\n"
+)
+
+RAW_UNIX_LF = (
+    "GET /api/data HTTP/1.1\n"
+    "Host: example.com\n"
+    "Authorization: Bearer abc\n"
+    "\n"
+)
+
+RAW_CR_ONLY = (
+    "GET /api/v1/cr HTTP/1.1\r"
+    "Host: example.com\r"
+    "Authorization: Bearer v\r"
+    "\r"
+    "a=1"
+)
+
+RAW_NO_BLANK_LINE = (
+    "GET /api/v1/info HTTP/1.1\r\n"
+    "Host: example.com\r\n"
+    "Authorization: Bearer token"
+)
+
+RAW_PATCH = (
+    "PATCH /api/v1/items/5 HTTP/1.1\r\n"
+    "Host: example.com\r\n"
+    "Content-Type: application/json\r\n"
+    "\r\n"
+    '{"status": "active"}'
+)
+
+RAW_COLON_IN_VALUE = (
+    "GET /api/test HTTP/1.1\r\n"
+    "Host: example.com\r\n"
+    "Cookie: session=abc:def:ghi\r\n"
+    "\r\n"
+)
+
+RAW_BODY_NEWLINES = (
+    "POST /api/data HTTP/1.1\r\n"
+    "Host: example.com\r\n"
+    "\r\n"
+    '{\n  "key": "value"\n}'
+)
+
+
 class TestParseRawRequest:
     """Tests for parse_raw_request function."""
 
-    def test_basic_get_request(self):
-        raw = (
-            "GET /api/v1/users HTTP/1.1\r\n"
-            "Host: example.com\r\n"
-            "Authorization: Bearer victim_token_123\r\n"
-            "Accept: application/json\r\n"
-            "\r\n"
-        )
+    @pytest.mark.parametrize(
+        "raw,method,path",
+        [
+            (RAW_GET_BASIC, "GET", "/api/v1/users"),
+            (RAW_POST_JSON, "POST", "/api/v1/users/update"),
+            (RAW_PUT, "PUT", "/api/v1/profile/42"),
+            (RAW_DELETE, "DELETE", "/api/v1/users/99"),
+            (RAW_UNIX_LF, "GET", "/api/data"),
+            (RAW_CR_ONLY, "GET", "/api/v1/cr"),
+            (RAW_NO_BLANK_LINE, "GET", "/api/v1/info"),
+            (RAW_PATCH, "PATCH", "/api/v1/items/5"),
+        ],
+    )
+    def test_method_and_path(self, raw, method, path):
         result = parse_raw_request(raw)
-        assert result.method == "GET"
-        assert result.path == "/api/v1/users"
+        assert result.method == method
+        assert result.path == path
+
+    def test_basic_get_request(self):
+        result = parse_raw_request(RAW_GET_BASIC)
         assert result.headers["Host"] == "example.com"
         assert result.headers["Authorization"] == "Bearer victim_token_123"
         assert result.headers["Accept"] == "application/json"
         assert result.body is None
 
     def test_post_request_with_json_body(self):
-        raw = (
-            "POST /api/v1/users/update HTTP/1.1\r\n"
-            "Host: example.com\r\n"
-            "Content-Type: application/json\r\n"
-            "Authorization: Bearer admin_token\r\n"
-            "\r\n"
-            '{"name": "John", "role": "admin"}'
-        )
-        result = parse_raw_request(raw)
-        assert result.method == "POST"
-        assert result.path == "/api/v1/users/update"
+        result = parse_raw_request(RAW_POST_JSON)
         assert result.body == '{"name": "John", "role": "admin"}'
 
     def test_put_request(self):
-        raw = (
-            "PUT /api/v1/profile/42 HTTP/1.1\r\n"
-            "Host: api.target.com\r\n"
-            "Authorization: Bearer token\r\n"
-            "\r\n"
-            "field1=value1&field2=value2"
-        )
-        result = parse_raw_request(raw)
-        assert result.method == "PUT"
-        assert result.path == "/api/v1/profile/42"
+        result = parse_raw_request(RAW_PUT)
         assert result.body == "field1=value1&field2=value2"
 
     def test_delete_request_no_body(self):
-        raw = (
-            "DELETE /api/v1/users/99 HTTP/1.1\r\n"
-            "Host: example.com\r\n"
-            "Authorization: Bearer token\r\n"
-            "\r\n"
-        )
-        result = parse_raw_request(raw)
-        assert result.method == "DELETE"
-        assert result.path == "/api/v1/users/99"
+        result = parse_raw_request(RAW_DELETE)
         assert result.body is None
 
     def test_unix_line_endings(self):
-        raw = (
-            "GET /api/data HTTP/1.1\n"
-            "Host: example.com\n"
-            "Authorization: Bearer abc\n"
-            "\n"
-        )
-        result = parse_raw_request(raw)
-        assert result.method == "GET"
-        assert result.path == "/api/data"
+        result = parse_raw_request(RAW_UNIX_LF)
         assert result.headers["Authorization"] == "Bearer abc"
 
+    def test_cr_only_line_endings(self):
+        result = parse_raw_request(RAW_CR_ONLY)
+        assert result.headers == {
+            "Host": "example.com",
+            "Authorization": "Bearer v",
+        }
+        assert result.body == "a=1"
+
+    def test_single_crlf_is_not_a_blank_line(self):
+        result = parse_raw_request("GET / HTTP/1.1\r\nHost: x\r\nA: b")
+        assert result.headers == {"Host": "x", "A": "b"}
+        assert result.body is None
+
     def test_no_blank_line_no_body(self):
-        raw = (
-            "GET /api/v1/info HTTP/1.1\r\n"
-            "Host: example.com\r\n"
-            "Authorization: Bearer token"
-        )
-        result = parse_raw_request(raw)
-        assert result.method == "GET"
-        assert result.path == "/api/v1/info"
+        result = parse_raw_request(RAW_NO_BLANK_LINE)
         assert result.body is None
 
     def test_malformed_request_line_raises(self):
@@ -96,38 +154,46 @@ class TestParseRawRequest:
         with pytest.raises(ValueError, match="Malformed request line"):
             parse_raw_request(raw)
 
-    def test_patch_request(self):
+    def test_header_with_colon_in_value(self):
+        result = parse_raw_request(RAW_COLON_IN_VALUE)
+        assert result.headers["Cookie"] == "session=abc:def:ghi"
+
+    def test_body_with_newlines(self):
+        result = parse_raw_request(RAW_BODY_NEWLINES)
+        assert result.body is not None
+        assert '"key": "value"' in result.body
+
+    def test_common_header_names_are_shared(self):
         raw = (
-            "PATCH /api/v1/items/5 HTTP/1.1\r\n"
-            "Host: example.com\r\n"
-            "Content-Type: application/json\r\n"
+            "GET / HTTP/1.1\r\n"
+            "Authorization: Bearer x\r\n"
+            "X-Custom: 1\r\n"
             "\r\n"
-            '{"status": "active"}'
         )
         result = parse_raw_request(raw)
-        assert result.method == "PATCH"
-        assert result.path == "/api/v1/items/5"
+        keys = {k: k for k in result.headers}
+        assert keys["Authorization"] is sys.intern("Authorization")
+        assert result.headers["X-Custom"] == "1"
 
-    def test_header_with_colon_in_value(self):
+    def test_body_crlf_preserved(self):
         raw = (
-            "GET /api/test HTTP/1.1\r\n"
+            "POST /upload HTTP/1.1\r\n"
             "Host: example.com\r\n"
-            "Cookie: session=abc:def:ghi\r\n"
             "\r\n"
+            "--boundary\r\nfield=1\r\n--boundary--\r\n"
         )
         result = parse_raw_request(raw)
-        assert result.headers["Cookie"] == "session=abc:def:ghi"
+        assert result.body == "--boundary\r\nfield=1\r\n--boundary--\r\n"
 
-    def test_body_with_newlines(self):
-        raw = (
-            "POST /api/data HTTP/1.1\r\n"
-            "Host: example.com\r\n"
-            "\r\n"
-            '{\n  "key": "value"\n}'
-        )
+    def test_bytes_input(self):
+        raw = b"GET /caf\xc3\xa9 HTTP/1.1\r\nHost: example.com\r\n\r\n"
         result = parse_raw_request(raw)
-        assert result.body is not None
-        assert '"key": "value"' in result.body
+        assert result.path == "/caf\u00e9"
+        assert result.headers["Host"] == "example.com"
+
+    def test_invalid_utf8_raises_value_error(self):
+        with pytest.raises(ValueError):
+            parse_raw_request(b"GET / HTTP/1.1\r\nX: \xff\r\n\r\n")
 
     def test_parsed_request_repr(self):
         req = ParsedRequest("GET", "/test", {"Host": "x"}, None)
@@ -149,7 +215,13 @@ class TestLoadRequestFile:
         f = tmp_path / "req.txt"
         f.write_text("GET /test HTTP/1.1\r\nHost: x\r\n\r\n")
         content = load_request_file(str(f))
-        assert "GET /test" in content
+        assert content.startswith(b"GET /test")
+
+    def test_load_preserves_crlf(self, tmp_path):
+        f = tmp_path / "req.txt"
+        f.write_bytes(b"GET /test HTTP/1.1\r\nHost: x\r\n\r\n")
+        content = load_request_file(str(f), size=5)
+        assert content == b"GET /test HTTP/1.1\r\nHost: x\r\n\r\n"
 
     def test_load_nonexistent_file(self):
         with pytest.raises(FileNotFoundError):